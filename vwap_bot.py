@@ -1,10 +1,18 @@
+import asyncio
+import atexit
+import aiohttp
+from cachetools import TTLCache
 import discord
 from discord.ext import commands, tasks
-import requests
 from dotenv import load_dotenv
+import heapq
+import msgspec
 import os
-import json
-from datetime import datetime, timezone, timedelta
+import orjson
+import sys
+import time
+from typing import List, Optional
+from datetime import datetime, timezone
 
 # Load environment variables from .env file
 load_dotenv()
@@ -17,30 +25,241 @@ intents.message_content = True
 # Initialize the bot with intents
 bot = commands.Bot(command_prefix="!", intents=intents)
 
+# Shared keep-alive HTTP session for DexScreener requests, created in on_ready
+bot.http_session = None
+
+# Channel that receives price alerts; looked up by name in on_ready unless set in .env
+ALERTS_CHANNEL_NAME = "price-alerts"
+ALERTS_CHANNEL_ID = int(os.getenv("ALERTS_CHANNEL_ID")) if os.getenv("ALERTS_CHANNEL_ID") else None
+bot.alerts_channel_id = ALERTS_CHANNEL_ID
+
+# Maximum number of characters Discord allows in a single message
+DISCORD_MESSAGE_LIMIT = 2000
+
+# Formatted !list_alerts messages, rebuilt after any alert is added, removed or triggered
+alerts_render_cache = None
+
+# Replace with the actual ID of the @vwap role tagged on every alert
+VWAP_ROLE_ID = 1302956931840737412
+VWAP_ROLE_MENTION = f"<@&{VWAP_ROLE_ID}>"
+
 # Dictionary to store coin alerts with contract addresses and VWAP levels
 price_alerts = {}
 
+# Alerts whose last known price is far from the VWAP level; these are polled
+# by monitor_far_prices every 10 minutes instead of by monitor_prices every minute
+far_alerts = set()
+
+# Relative distance from the VWAP level above which an alert moves to the slow
+# poll, and below which it moves back; alerts in between keep their cadence
+FAR_THRESHOLD = 0.5
+NEAR_THRESHOLD = 0.2
+
+# Minimum number of seconds between two alerts for the same token
+ALERT_COOLDOWN = 24 * 60 * 60
+
+# Seconds after which an alert that was neither set nor triggered in that time is removed
+STALE_ALERT_AGE = 30 * 24 * 60 * 60
+
+# Price checks slower than this many seconds move borderline alerts to the slow poll
+SLOW_TICK_SECONDS = 45
+
+# Ensures the near and far price checks never run at the same time; created in main()
+# so it belongs to the running event loop
+monitor_lock = None
+
+# Guards mutations of price_alerts against the monitor loop applying its updates; created in main()
+alerts_lock = None
+
 # File to store alerts
 ALERTS_FILE = 'alerts.json'
 
+# Append-only log of per-alert updates, replayed over ALERTS_FILE at startup
+ALERTS_LOG_FILE = 'alerts.log'
+
+# Size in bytes after which the log is compacted into a fresh ALERTS_FILE snapshot
+ALERTS_LOG_MAX_BYTES = 4096
+
+# Delay in seconds used to coalesce alert changes into a single write
+SAVE_DELAY = 0.5
+
+# Delay in seconds before retrying a failed alerts write
+SAVE_RETRY_DELAY = 30
+
+# Debounced write-behind state: whether a full snapshot is needed, log lines
+# not yet written, the current log size, and the write task (at most one runs at a time)
+alerts_dirty = False
+pending_log_lines = []
+alerts_log_size = 0
+save_task = None
+
+# Maximum number of addresses DexScreener accepts in one tokens request
+DEXSCREENER_BATCH_SIZE = 30
+
+# Recent DexScreener responses keyed by the requested address(es), so that
+# back-to-back lookups of the same token within 30 seconds share one HTTP call
+token_pairs_cache = TTLCache(maxsize=512, ttl=30)
+
+# DexScreener requests currently in flight, shared by concurrent callers
+pending_requests = {}
+
+class PairLiquidity(msgspec.Struct):
+    """Liquidity of a DexScreener pair; only the USD value is decoded."""
+    usd: float = 0.0
+
+class PairBaseToken(msgspec.Struct):
+    """Base token of a DexScreener pair; only the address is decoded."""
+    address: str
+
+class PairPrice(msgspec.Struct):
+    """The subset of a DexScreener pair needed to check alerts."""
+    baseToken: PairBaseToken
+    priceUsd: Optional[str] = None
+    liquidity: PairLiquidity = msgspec.field(default_factory=PairLiquidity)
+
+class TokenPrices(msgspec.Struct):
+    """The subset of a DexScreener tokens response needed to check alerts."""
+    pairs: Optional[List[PairPrice]] = None
+
+# Decodes only the fields in TokenPrices, skipping everything else in the response
+token_prices_decoder = msgspec.json.Decoder(TokenPrices)
+
 def save_alerts():
-    """Saves the current alerts to a JSON file."""
-    with open(ALERTS_FILE, 'w') as f:
-        json.dump(price_alerts, f, default=str)  # Use default=str to handle datetime serialization
+    """Saves the current alerts to a JSON file and truncates the update log."""
+    write_alerts_file(orjson.dumps(price_alerts))
+
+def write_alerts_file(payload):
+    """Atomically replaces the alerts file with the given JSON payload and truncates the update log."""
+    tmp_path = f"{ALERTS_FILE}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, ALERTS_FILE)
+    open(ALERTS_LOG_FILE, 'wb').close()
+
+def append_log_lines(lines):
+    """Appends update records to the alerts log."""
+    with open(ALERTS_LOG_FILE, 'ab') as f:
+        f.writelines(lines)
+
+def schedule_save():
+    """Marks the alerts as changed and schedules a debounced snapshot write to disk."""
+    global alerts_dirty, alerts_render_cache
+    alerts_dirty = True
+    alerts_render_cache = None
+    schedule_flush()
+
+def record_alert_update(contract_address, **fields):
+    """Records changed fields of a single alert in the update log."""
+    global alerts_render_cache
+    alerts_render_cache = None
+    pending_log_lines.append(orjson.dumps({'op': 'update', 'addr': contract_address, **fields}) + b"\n")
+    schedule_flush()
+
+def schedule_flush():
+    """Schedules a debounced write of pending alert changes."""
+    global save_task
+    if save_task is None or save_task.done():
+        save_task = asyncio.create_task(flush_alerts(SAVE_DELAY))
+
+async def flush_alerts(delay=0):
+    """
+    Writes pending alert changes to disk off the event loop. Updates are appended to the log
+    unless a full snapshot is needed or the log has grown past ALERTS_LOG_MAX_BYTES.
+    Keeps writing until no changes are left, including ones made during a write,
+    and retries after SAVE_RETRY_DELAY if a write fails.
+    """
+    global alerts_dirty, alerts_log_size
+    await asyncio.sleep(delay)
+    loop = asyncio.get_running_loop()
+    while alerts_dirty or pending_log_lines:
+        lines = pending_log_lines[:]
+        pending_log_lines.clear()
+        log_bytes = sum(len(line) for line in lines)
+        if alerts_dirty or alerts_log_size + log_bytes > ALERTS_LOG_MAX_BYTES:
+            previous_log_size = alerts_log_size
+            alerts_dirty = False
+            alerts_log_size = 0
+            # Serialize on the loop so the snapshot is consistent, write in a worker thread
+            payload = orjson.dumps(price_alerts)
+            try:
+                await loop.run_in_executor(None, write_alerts_file, payload)
+            except OSError as e:
+                # The snapshot includes the log lines, so writing it again later covers them too
+                alerts_dirty = True
+                alerts_log_size = previous_log_size
+                print(f"Failed to save alerts, retrying in {SAVE_RETRY_DELAY}s: {e!r}")
+                await asyncio.sleep(SAVE_RETRY_DELAY)
+        else:
+            try:
+                await loop.run_in_executor(None, append_log_lines, lines)
+                alerts_log_size += log_bytes
+            except OSError as e:
+                pending_log_lines[:0] = lines
+                print(f"Failed to save alert updates, retrying in {SAVE_RETRY_DELAY}s: {e!r}")
+                await asyncio.sleep(SAVE_RETRY_DELAY)
+
+@atexit.register
+def flush_alerts_on_exit():
+    """Writes any alert changes still pending when the process exits."""
+    if alerts_dirty or pending_log_lines:
+        save_alerts()
 
 def load_alerts():
-    """Loads alerts from a JSON file."""
-    global price_alerts
+    """
+    Loads alerts from a JSON file and replays the update log on top of it.
+    Returns True if any alert was migrated or backfilled and should be saved again.
+    """
+    global price_alerts, alerts_log_size, alerts_render_cache
+    alerts_log_size = 0
+    alerts_render_cache = None
     try:
-        with open(ALERTS_FILE, 'r') as f:
-            price_alerts = json.load(f)
-            # Convert string timestamps back to datetime objects
-            for alert in price_alerts.values():
-                if alert['last_alert_time']:
-                    alert['last_alert_time'] = datetime.fromisoformat(alert['last_alert_time'])
+        with open(ALERTS_FILE, 'rb') as f:
+            price_alerts = orjson.loads(f.read())
     except FileNotFoundError:
         price_alerts = {}
 
+    try:
+        with open(ALERTS_LOG_FILE, 'rb') as f:
+            for line in f:
+                alerts_log_size += len(line)
+                try:
+                    record = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    continue  # Skip a partially written trailing record
+                alert = price_alerts.get(record.pop('addr', None))
+                if record.pop('op', None) == 'update' and alert is not None:
+                    alert.update(record)
+    except FileNotFoundError:
+        pass
+
+    migrated = False
+    for alert in price_alerts.values():
+        if isinstance(alert['last_alert_time'], str):
+            # Migrate ISO timestamps saved before alert times were stored as epoch seconds
+            alert['last_alert_time'] = datetime.fromisoformat(alert['last_alert_time']).timestamp()
+            migrated = True
+        if 'vwap_level_inv' not in alert:
+            alert.update(vwap_bounds(alert['vwap_level']))  # Backfill alerts saved before bounds were stored
+            migrated = True
+        if 'created_at' not in alert:
+            alert['created_at'] = time.time()  # Give alerts saved before creation times were stored a full grace period
+            migrated = True
+        if 'embed_template' not in alert:
+            alert['embed_template'] = alert_embed_template(alert['user'], alert['profile_pic'])
+            migrated = True
+    return migrated
+
+def vwap_bounds(vwap_level):
+    """
+    Returns the ±10% alert range and the inverse of the VWAP level,
+    stored on each alert so the monitor loop doesn't recompute them.
+    """
+    return {
+        'lower_bound': vwap_level * 0.9,
+        'upper_bound': vwap_level * 1.1,
+        'vwap_level_inv': 1.0 / vwap_level
+    }
+
 @bot.command()
 async def vwap(ctx, contract_address: str, vwap_level: float):
     """
@@ -48,7 +267,7 @@ async def vwap(ctx, contract_address: str, vwap_level: float):
     and sets a VWAP level alert within ±10%.
     """
     contract_address = contract_address.lower()
-    top_pairs = fetch_top_pairs(contract_address, top_n=5)
+    top_pairs = await fetch_top_pairs(contract_address, top_n=5)
     
     if top_pairs:
         # Choose the highest liquidity pair
@@ -90,15 +309,25 @@ async def vwap(ctx, contract_address: str, vwap_level: float):
         )
 
         # Set VWAP level alert
-        price_alerts[contract_address] = {
-            'vwap_level': vwap_level,
-            'ticker': ticker,
-            'current_price': current_price,
-            'user': ctx.author.display_name,
-            'profile_pic': ctx.author.display_avatar.url,
-            'last_alert_time': None  # To track the last alert time for 24-hour restriction
-        }
-        save_alerts()  # Save alerts after adding a new one
+        async with alerts_lock:
+            price_alerts[contract_address] = {
+                'vwap_level': vwap_level,
+                'ticker': ticker,
+                'current_price': current_price,
+                'user': ctx.author.display_name,
+                'user_id': ctx.author.id,
+                'profile_pic': ctx.author.display_avatar.url,
+                'embed_template': alert_embed_template(
+                    ctx.author.display_name,
+                    ctx.author.display_avatar.url,
+                    top_pair['info']['imageUrl']
+                ),
+                'last_alert_time': None,  # Epoch seconds of the last alert, for the 24-hour restriction
+                'created_at': time.time(),
+                **vwap_bounds(vwap_level)
+            }
+            far_alerts.discard(contract_address)  # Check new alerts on the next tick
+        schedule_save()  # Save alerts after adding a new one
         alert_msg = f"Alert set: Notify when price is within ±10% of VWAP level ${vwap_level}"
         embed.add_field(name="📌 Alert", value=alert_msg, inline=False)
         
@@ -111,110 +340,303 @@ async def vwap(ctx, contract_address: str, vwap_level: float):
     else:
         await ctx.send(f"No trading pairs found for contract {contract_address}. Please verify the address.")
 
-@tasks.loop(minutes=1)
+@tasks.loop(minutes=1, reconnect=True)
 async def monitor_prices():
     """
-    Periodically checks prices for each token in the watch list
+    Periodically checks prices for each token in the watch list that is near its VWAP level
     and sends an alert if the price is within ±10% of the VWAP level,
     with a restriction to only send one alert per 24 hours.
     """
-    for contract_address, alert_data in price_alerts.items():
-        token_data = fetch_token_pairs(contract_address)
-        
-        if token_data and 'pairs' in token_data:
-            current_price = float(token_data['pairs'][0]['priceUsd'])
-            ticker = alert_data['ticker']
-            alert_data['current_price'] = current_price
+    await run_monitor_tick(far=False)
 
-            print(f"Checking price for {ticker}: ${current_price}")  # Log current price
-
-            # Check VWAP level range
-            vwap_level = alert_data['vwap_level']
-            lower_bound = vwap_level * 0.9
-            upper_bound = vwap_level * 1.1
-            
-            # Calculate the absolute and percentage differences
-            difference = current_price - vwap_level
-            percentage_difference = (difference / vwap_level) * 100
-
-            # Check if current price is within the VWAP range and if 24 hours have passed since the last alert
-            if lower_bound <= current_price <= upper_bound:
-                last_alert_time = alert_data.get('last_alert_time')
-                if last_alert_time is None or (datetime.now(timezone.utc) - last_alert_time) >= timedelta(days=1):
-                    # Update last alert time
-                    alert_data['last_alert_time'] = datetime.now(timezone.utc)
-                    save_alerts()  # Save alerts after updating the last alert time
-                    await send_alert_message(
-                        f"{ticker} is near the VWAP!\n\nCurrent price: ${current_price:.2f} ({percentage_difference:+.2f}%)",
-                        alert_data['user'],
-                        alert_data['profile_pic']
-                    )
-        else:
+@tasks.loop(minutes=10, reconnect=True)
+async def monitor_far_prices():
+    """
+    Periodically checks prices for tokens whose last known price was far from their VWAP level.
+    """
+    await run_monitor_tick(far=True)
+
+@monitor_prices.before_loop
+@monitor_far_prices.before_loop
+async def wait_until_ready():
+    """
+    Waits for the bot to connect before the first price check.
+    """
+    await bot.wait_until_ready()
+
+async def run_monitor_tick(far):
+    """
+    Checks either the near or the far alerts without overlapping any other check.
+    If checking the near alerts took longer than SLOW_TICK_SECONDS, alerts that
+    are no longer close to their VWAP level are moved to the slower poll.
+    """
+    async with monitor_lock:
+        started = time.monotonic()
+        try:
+            await check_alerts({ca: ad for ca, ad in price_alerts.items() if (ca in far_alerts) == far})
+        except Exception as e:
+            # tasks.loop stops for good on an unhandled error; log it and try again next tick
+            print(f"Price check failed: {e!r}")
+        duration = time.monotonic() - started
+    print(f"Checked {'far' if far else 'near'} alerts in {duration:.1f}s")  # Log tick duration
+
+    if not far and duration > SLOW_TICK_SECONDS:
+        demoted = [
+            ca for ca, ad in price_alerts.items()
+            if ca not in far_alerts and abs(ad['current_price'] - ad['vwap_level']) * ad['vwap_level_inv'] >= NEAR_THRESHOLD
+        ]
+        far_alerts.update(demoted)
+        print(f"Near alerts took {duration:.1f}s to check, moved {len(demoted)} to the slow poll")
+
+async def check_alerts(watchlist):
+    """
+    Fetches prices for a snapshot of the watch list, applies the resulting updates
+    and sends any triggered alerts. Working on a snapshot lets commands add or
+    remove alerts while requests are in flight.
+    """
+    results = await fetch_many(list(watchlist))
+
+    # Fall back to single-token requests only for tokens missing from the batched responses
+    missing = [ca for ca in watchlist if ca not in results]
+    if missing:
+        fallbacks = await asyncio.gather(*(fetch_top_pairs(ca) for ca in missing), return_exceptions=True)
+        for contract_address, top_pairs in zip(missing, fallbacks):
+            if isinstance(top_pairs, Exception):
+                print(f"Failed to retrieve pairs for contract {contract_address}: {top_pairs!r}")
+                continue
+            # Use the highest-liquidity pair that actually reports a price
+            prices = (parse_price(pair.get('priceUsd')) for pair in top_pairs or [])
+            current_price = next((price for price in prices if price is not None), None)
+            if current_price is not None:
+                results[contract_address] = current_price
+
+    # Log tokens without price data and work out which alerts are due
+    now = time.time()
+    checked = []
+    for contract_address, alert_data in watchlist.items():
+        current_price = results.get(contract_address)
+        if current_price is None:
             print(f"Data not found for contract {contract_address}")  # Log if no data is found
+            continue
+        print(f"Checking price for {alert_data['ticker']}: ${current_price}")  # Log current price
+        try:
+            is_due = is_alert_due(alert_data, current_price, now)
+            distance = abs(current_price - alert_data['vwap_level']) * alert_data['vwap_level_inv']
+        except (KeyError, TypeError, ValueError) as e:
+            # A malformed alert must not stop the checks for every other token
+            print(f"Failed to check alert for contract {contract_address}: {e!r}")
+            continue
+        checked.append((contract_address, alert_data, current_price, is_due, distance))
 
-async def send_alert_message(message, user, profile_pic):
+    # Apply all updates at once, skipping alerts that were removed or replaced meanwhile
+    triggered = []
+    async with alerts_lock:
+        for contract_address, alert_data, current_price, is_due, distance in checked:
+            if price_alerts.get(contract_address) is not alert_data:
+                continue
+            alert_data['current_price'] = current_price
+
+            # Re-bucket the alert by how far its price is from the VWAP level
+            if distance > FAR_THRESHOLD:
+                far_alerts.add(contract_address)
+            elif distance < NEAR_THRESHOLD:
+                far_alerts.discard(contract_address)
+
+            if is_due:
+                alert_data['last_alert_time'] = now
+                record_alert_update(  # Log the changed fields instead of rewriting all alerts
+                    contract_address,
+                    last_alert_time=now,
+                    current_price=current_price
+                )
+                triggered.append(alert_data)
+
+    outcomes = await asyncio.gather(
+        *(send_alert_message(alert_message(alert_data), alert_data['embed_template']) for alert_data in triggered),
+        return_exceptions=True
+    )
+    for outcome in outcomes:
+        if isinstance(outcome, Exception):
+            print(f"Failed to send alert: {outcome!r}")
+
+def is_alert_due(alert_data, current_price, now):
+    """
+    Returns whether the price is within ±10% of the VWAP level
+    and no alert was sent for the token in the last 24 hours.
+    """
+    last_alert_time = alert_data['last_alert_time']
+    return (
+        alert_data['lower_bound'] <= current_price <= alert_data['upper_bound']
+        and (last_alert_time is None or now - last_alert_time >= ALERT_COOLDOWN)
+    )
+
+def alert_message(alert_data):
+    """
+    Formats the alert message for a token whose price is near its VWAP level.
+    """
+    current_price = alert_data['current_price']
+    percentage_difference = (current_price - alert_data['vwap_level']) * alert_data['vwap_level_inv'] * 100
+    return f"{alert_data['ticker']} is near the VWAP!\n\nCurrent price: ${current_price:.2f} ({percentage_difference:+.2f}%)"
+
+def alert_embed_template(user, profile_pic, thumbnail=None):
+    """
+    Builds the static part of an alert embed as a dict, stored on the alert
+    so only the message and timestamp are filled in when an alert is sent.
+    """
+    embed = discord.Embed(color=0xE74C3C)
+    embed.set_author(name=user, icon_url=profile_pic)  # Show who set the alert
+    if thumbnail:
+        embed.set_thumbnail(url=thumbnail)
+    return embed.to_dict()
+
+@tasks.loop(hours=24)
+async def prune_stale_alerts():
+    """
+    Removes alerts that were set more than 30 days ago and haven't triggered in the last 30 days,
+    so the watch list and alerts file don't grow without bound.
+    """
+    cutoff = time.time() - STALE_ALERT_AGE
+    async with alerts_lock:
+        stale = {
+            contract_address: alert_data for contract_address, alert_data in price_alerts.items()
+            if max(alert_data['created_at'], alert_data['last_alert_time'] or 0) < cutoff
+        }
+        for contract_address in stale:
+            del price_alerts[contract_address]
+            far_alerts.discard(contract_address)
+    if stale:
+        schedule_save()  # Save alerts after removing stale ones
+        print(f"Removed {len(stale)} stale alerts: {', '.join(stale)}")
+
+        outcomes = await asyncio.gather(
+            *(notify_pruned_alert(ca, ad) for ca, ad in stale.items()),
+            return_exceptions=True
+        )
+        for outcome in outcomes:
+            if isinstance(outcome, Exception):
+                print(f"Failed to notify about a removed alert: {outcome!r}")
+
+async def notify_pruned_alert(contract_address, alert_data):
+    """
+    Tells the user who set an alert that it was removed for inactivity, by DM if possible.
+    Alerts saved before user IDs were stored, or users who don't accept DMs, are
+    announced in the alerts channel instead.
+    """
+    message = (
+        f"Your VWAP alert for {alert_data['ticker']} (`{contract_address}`, VWAP: ${alert_data['vwap_level']}) "
+        f"was removed after {STALE_ALERT_AGE // 86400} days without triggering. Use !vwap to set it again."
+    )
+    user_id = alert_data.get('user_id')
+    if user_id:
+        try:
+            user = bot.get_user(user_id) or await bot.fetch_user(user_id)
+            await user.send(message)
+            return
+        except discord.HTTPException as e:
+            print(f"Failed to DM user {user_id} about a removed alert: {e!r}")
+
+    channel = get_alerts_channel()
+    if channel:
+        await channel.send(f"{alert_data['user']}: {message}")
+
+async def send_alert_message(message, embed_template):
     """
     Sends a message to the 'price-alerts' channel in Discord with user context and tags the @vwap role.
     """
-    # Replace ROLE_ID with the actual ID of the @vwap role
-    vwap_role_id = "1302956931840737412"  # Example: "123456789012345678"
-    
-    channel = discord.utils.get(bot.get_all_channels(), name="price-alerts")
+    channel = get_alerts_channel()
     if channel:
         # Embed the message content
-        embed = discord.Embed(description=message, color=0xE74C3C, timestamp=datetime.now(timezone.utc))
-        embed.set_author(name=user, icon_url=profile_pic)  # Show who set the alert
+        embed = discord.Embed.from_dict(embed_template)
+        embed.description = message
+        embed.timestamp = datetime.now(timezone.utc)
 
         # Send the message tagging @vwap role
-        await channel.send(content=f"<@&{vwap_role_id}>", embed=embed)
+        await channel.send(content=VWAP_ROLE_MENTION, embed=embed)
+
+def get_alerts_channel():
+    """
+    Returns the channel for price alerts, or None if it can't be found.
+    Without a configured ALERTS_CHANNEL_ID, a channel that was missing at startup
+    or has been recreated is looked up by name again and its ID cached.
+    """
+    channel = bot.get_channel(bot.alerts_channel_id) if bot.alerts_channel_id else None
+    if channel:
+        return channel
+    if ALERTS_CHANNEL_ID is not None:
+        print(f"Configured alerts channel {ALERTS_CHANNEL_ID} not found.")
+        return None
+    channel = discord.utils.get(bot.get_all_channels(), name=ALERTS_CHANNEL_NAME)
+    if channel:
+        bot.alerts_channel_id = channel.id
     else:
-        print("No 'price-alerts' channel found.")
+        print(f"No '{ALERTS_CHANNEL_NAME}' channel found.")
+    return channel
 
 @bot.command()
 async def list_alerts(ctx):
     """
     Lists all the current alerts set by users.
     """
+    global alerts_render_cache
     if price_alerts:
-        alert_list = "\n".join(
-            [f"{data['ticker']} (VWAP: ${data['vwap_level']}, Last Alert: {data['last_alert_time']})" 
-             for data in price_alerts.values()]
-        )
-        await ctx.send(f"**Current Alerts:**\n{alert_list}")
+        if alerts_render_cache is None:
+            alerts_render_cache = render_alerts()
+        for message in alerts_render_cache:
+            await ctx.send(message)
     else:
         await ctx.send("No alerts are currently set.")
 
+def render_alerts():
+    """
+    Formats the current alerts as a list of messages, each within Discord's message length limit.
+    """
+    messages = []
+    current = "**Current Alerts:**"
+    for data in price_alerts.values():
+        line = f"{data['ticker']} (VWAP: ${data['vwap_level']}, Last Alert: {format_alert_time(data['last_alert_time'])})"
+        if len(current) + 1 + len(line) > DISCORD_MESSAGE_LIMIT:
+            messages.append(current)
+            current = line
+        else:
+            current = f"{current}\n{line}"
+    messages.append(current)
+    return messages
+
 @bot.command()
 async def remove_token(ctx, contract_address: str):
     """
     Removes a specified token's alert by its contract address.
     """
     contract_address = contract_address.lower()
-    if contract_address in price_alerts:
-        del price_alerts[contract_address]
-        save_alerts()  # Save alerts after removing one
+    async with alerts_lock:
+        removed = price_alerts.pop(contract_address, None)
+        far_alerts.discard(contract_address)
+    if removed is not None:
+        schedule_save()  # Save alerts after removing one
         await ctx.send(f"Alert for contract {contract_address} has been removed.")
     else:
         await ctx.send(f"No alert found for contract {contract_address}.")
 
-def fetch_top_pairs(contract_address, top_n=5):
+async def fetch_top_pairs(contract_address, top_n=5):
     """
     Retrieves top trading pairs for a given token address, sorted by liquidity.
     """
-    url = f"https://api.dexscreener.com/latest/dex/tokens/{contract_address}"
-    response = requests.get(url)
-    if response.status_code == 200:
-        pairs = response.json().get('pairs', [])
-        
-        # Filter pairs with liquidity info and sort by liquidity
-        pairs_with_liquidity = [pair for pair in pairs if 'liquidity' in pair and 'usd' in pair['liquidity']]
-        sorted_pairs = sorted(pairs_with_liquidity, key=lambda x: x['liquidity']['usd'], reverse=True)
-        
-        # Return only the top N pairs
-        return sorted_pairs[:top_n]
-    else:
-        print(f"Failed to retrieve pairs for contract {contract_address}")
+    token_data = await fetch_token_pairs(contract_address)
+    if token_data is None:
         return None
+    pairs = token_data.get('pairs') or []
+
+    # Return only the top N pairs with liquidity info, sorted by liquidity
+    pairs_with_liquidity = (pair for pair in pairs if 'liquidity' in pair and 'usd' in pair['liquidity'])
+    return heapq.nlargest(top_n, pairs_with_liquidity, key=lambda x: x['liquidity']['usd'])
+
+def format_alert_time(epoch):
+    """
+    Formats an alert time stored as epoch seconds for display.
+    """
+    if epoch is None:
+        return "Never"
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).strftime('%Y-%m-%d %H:%M UTC')
 
 def calculate_age(timestamp):
     """
@@ -224,27 +646,124 @@ def calculate_age(timestamp):
     created_at = datetime.fromtimestamp(timestamp / 1000, tz=timezone.utc)
     return (now - created_at).days
 
-def fetch_token_pairs(contract_address):
+async def fetch_token_pairs(contract_address, prices_only=False):
     """
     Fetches all available trading pairs for a given token address.
+    With prices_only, the response is decoded into a TokenPrices struct instead of a dict.
+    Responses are cached for a short time and concurrent requests for the
+    same address are coalesced into a single HTTP call.
+    """
+    key = (contract_address, prices_only)
+    if key in token_pairs_cache:
+        return token_pairs_cache[key]
+
+    request = pending_requests.get(key)
+    if request is None:
+        request = asyncio.create_task(request_token_pairs(contract_address, prices_only))
+        pending_requests[key] = request
+        request.add_done_callback(lambda _: pending_requests.pop(key, None))
+    return await asyncio.shield(request)
+
+async def request_token_pairs(contract_address, prices_only=False):
+    """
+    Requests trading pairs from DexScreener and caches successful responses.
     """
     url = f"https://api.dexscreener.com/latest/dex/tokens/{contract_address}"
-    response = requests.get(url)
-    if response.status_code == 200:
-        return response.json()
-    print(f"Failed to retrieve data for contract {contract_address}. Status code: {response.status_code}")
-    return None
+    async with bot.http_session.get(url) as response:
+        if response.status == 200:
+            body = await response.read()
+            token_data = token_prices_decoder.decode(body) if prices_only else orjson.loads(body)
+            token_pairs_cache[(contract_address, prices_only)] = token_data
+            return token_data
+        print(f"Failed to retrieve data for contract {contract_address}. Status code: {response.status}")
+        return None
+
+async def fetch_many(addresses):
+    """
+    Fetches the USD price of the highest-liquidity pair for each token address,
+    batching up to DEXSCREENER_BATCH_SIZE addresses into a single request.
+    Returns a dict keyed by lowercase base token address.
+    """
+    chunks = [addresses[i:i + DEXSCREENER_BATCH_SIZE] for i in range(0, len(addresses), DEXSCREENER_BATCH_SIZE)]
+    responses = await asyncio.gather(
+        *(fetch_token_pairs(",".join(chunk), prices_only=True) for chunk in chunks),
+        return_exceptions=True
+    )
+
+    best_pairs = {}
+    for chunk, token_prices in zip(chunks, responses):
+        if isinstance(token_prices, Exception):
+            print(f"Failed to retrieve data for {len(chunk)} contracts: {token_prices!r}")
+            continue
+        if not token_prices:
+            continue
+        for pair in token_prices.pairs or []:
+            price = parse_price(pair.priceUsd)
+            if price is None:
+                continue
+            address = pair.baseToken.address.lower()
+            best = best_pairs.get(address)
+            if best is None or pair.liquidity.usd > best[0]:
+                best_pairs[address] = (pair.liquidity.usd, price)
+    return {address: price for address, (_, price) in best_pairs.items()}
+
+def parse_price(value):
+    """
+    Parses a DexScreener USD price, returning None if it is missing or malformed.
+    """
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
 
 @bot.event
 async def on_ready():
     """
-    Called when the bot is ready. Starts the price-monitoring loop and loads saved alerts.
+    Called when the bot is ready, including after reconnects. Starts the price-monitoring loops.
     """
     print(f"Bot is online as {bot.user}")
-    load_alerts()  # Load alerts from file
+    if bot.http_session is None or bot.http_session.closed:
+        # Reuse pooled connections to DexScreener instead of a new TCP/TLS handshake per request
+        bot.http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=50, limit_per_host=20, ttl_dns_cache=300, keepalive_timeout=60),
+            timeout=aiohttp.ClientTimeout(total=10)
+        )
+    if bot.alerts_channel_id is None:
+        # Find the alerts channel once instead of scanning every channel per alert
+        channel = discord.utils.get(bot.get_all_channels(), name=ALERTS_CHANNEL_NAME)
+        if channel:
+            bot.alerts_channel_id = channel.id
     if not monitor_prices.is_running():
         monitor_prices.start()
         print("Price monitoring has started")
+    if not monitor_far_prices.is_running():
+        monitor_far_prices.start()
+    if not prune_stale_alerts.is_running():
+        prune_stale_alerts.start()
+
+async def main():
+    """
+    Loads saved alerts, runs the bot and closes the shared HTTP session on shutdown.
+    """
+    global monitor_lock, alerts_lock
+    discord.utils.setup_logging()  # bot.run() would install this handler; bot.start() does not
+    # Create locks on the running loop; on Python 3.8/3.9 they would otherwise bind to another loop
+    monitor_lock = asyncio.Lock()
+    alerts_lock = asyncio.Lock()
+    # Load alerts once here rather than in on_ready, which fires again after reconnects
+    # and would overwrite changes that haven't been written to disk yet
+    if load_alerts():
+        schedule_save()  # Persist migrated and backfilled fields so created_at survives restarts
+    async with bot:
+        try:
+            await bot.start(TOKEN)
+        finally:
+            if bot.http_session is not None:
+                await bot.http_session.close()
 
-# Run the bot
-bot.run(TOKEN)
+# Run the bot, on the faster uvloop event loop where it is available (it does not support Windows)
+if sys.platform != "win32":
+    import uvloop
+    uvloop.run(main())
+else:
+    asyncio.run(main())